@@ -9,3 +9,4 @@ SPEC_FILE = os.path.join(BASE_DIR, "spec.md")
 
 MAX_RETRIES = 5
 SUBPROCESS_TIMEOUT_SECONDS = 120
+OUTPUT_TAIL_BYTES = 10000
@@ -1,43 +1,81 @@
 import os
 import json
-import subprocess
 import time
 import sys
 from pathlib import Path
 
-STATE_FILE = "state.json"
-WORKSPACE_DIR = Path("workspace")
-SPEC_FILE = Path("spec.md")
-MAX_RETRIES = 5
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+import config
+
+STATE_FILE = config.STATE_FILE
+WORKSPACE_DIR = Path(config.WORKSPACE_DIR)
+SPEC_FILE = Path(config.SPEC_FILE)
+LOGS_DIR = Path(config.LOGS_DIR)
+MAX_RETRIES = config.MAX_RETRIES
+OUTPUT_TAIL_BYTES = config.OUTPUT_TAIL_BYTES
 
 
 def load_state():
-    if not Path(STATE_FILE).exists():
+    try:
+        with open(STATE_FILE, "rb") as f:
+            content = f.read().strip()
+    except FileNotFoundError:
+        return {}
+    if not content:
         return {}
-    with open(STATE_FILE, "r") as f:
-        content = f.read().strip()
-        if not content:
-            return {}
-        return json.loads(content)
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+_last_saved_state = None
 
 
 def save_state(state):
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    global _last_saved_state
+    if orjson is not None:
+        blob = orjson.dumps(state)
+    else:
+        blob = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    if blob == _last_saved_state:
+        return
+    tmp_file = STATE_FILE + ".tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, STATE_FILE)
+    dir_fd = os.open(os.path.dirname(STATE_FILE) or ".", os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+    _last_saved_state = blob
+
+
+_ts_cache = [0, ""]
 
 
 def log(msg):
-    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {msg}")
+    sec = int(time.time())
+    if sec != _ts_cache[0]:
+        _ts_cache[0] = sec
+        _ts_cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+    print(f"[{_ts_cache[1]}] {msg}")
 
 
 def generate_from_spec():
     log("GENERATING from spec.md")
 
-    if not SPEC_FILE.exists():
+    try:
+        spec = SPEC_FILE.read_text()
+    except FileNotFoundError:
         return
 
-    spec = SPEC_FILE.read_text()
-
     if "multiply" in spec:
         (WORKSPACE_DIR / "app").mkdir(exist_ok=True)
         (WORKSPACE_DIR / "tests").mkdir(exist_ok=True)
@@ -57,14 +95,23 @@ def generate_from_spec():
 
 
 def run_tests():
+    import subprocess
+
     log("TESTING...")
-    result = subprocess.run(
-        [sys.executable, "-m", "pytest", "-q"],
-        cwd=str(WORKSPACE_DIR),
-        capture_output=True,
-        text=True
-    )
-    return result.returncode == 0, result.stdout + result.stderr
+    LOGS_DIR.mkdir(exist_ok=True)
+    output_file = LOGS_DIR / "pytest.log"
+    with open(output_file, "wb") as f:
+        result = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q"],
+            cwd=str(WORKSPACE_DIR),
+            stdout=f,
+            stderr=subprocess.STDOUT
+        )
+    with open(output_file, "rb") as f:
+        f.seek(0, 2)
+        f.seek(max(0, f.tell() - OUTPUT_TAIL_BYTES))
+        tail = f.read().decode("utf-8", errors="replace")
+    return result.returncode == 0, tail
 
 
 def run():